@@ -1,8 +1,6 @@
 # import dependencies
 from pyomo.environ import ConcreteModel, Set, Var, Objective, minimize, Constraint
 from pyomo.core.expr.numvalue import NumericValue
-import pandas as pd
-import numpy as np
 
 from . import CNLS
 from .constant import CET_ADDI, FUN_COST, FUN_PROD, RTS_VRS,RTS_CRS, OPT_DEFAULT, OPT_LOCAL
@@ -267,18 +265,10 @@ class CNLSDDF(CNLS.CNLS):
     def get_gamma(self):
         """Return gamma value by array"""
         tools.assert_optimized(self.optimization_status)
-        gamma = np.asarray([i + tuple([j]) for i, j in zip(list(self.__model__.gamma),
-                                                           list(self.__model__.gamma[:, :].value))])
-        gamma = pd.DataFrame(gamma, columns=['Name', 'Key', 'Value'])
-        gamma = gamma.pivot(index='Name', columns='Key', values='Value')
-        return gamma.to_numpy()
+        return tools.to_2d_array(self.__model__.gamma)
 
     def get_delta(self):
         """Return delta value by array"""
         tools.assert_optimized(self.optimization_status)
         tools.assert_undesirable_output(self.b)
-        delta = np.asarray([i + tuple([j]) for i, j in zip(list(self.__model__.delta),
-                                                           list(self.__model__.delta[:, :].value))])
-        delta = pd.DataFrame(delta, columns=['Name', 'Key', 'Value'])
-        delta = delta.pivot(index='Name', columns='Key', values='Value')
-        return delta.to_numpy()
+        return tools.to_2d_array(self.__model__.delta)
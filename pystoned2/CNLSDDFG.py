@@ -1,6 +1,5 @@
 # import dependencies
 import numpy as np
-import pandas as pd
 from .utils import CNLSDDFG1,CNLSDDFG2, CNLSDDFZG1, CNLSDDFZG2, sweet, tools
 from .constant import CET_ADDI, FUN_PROD, FUN_COST, OPT_DEFAULT, RTS_CRS, RTS_VRS,OPT_LOCAL
 import time
@@ -27,9 +26,9 @@ class CNLSDDFG:
             rts (String, optional): RTS_VRS (variable returns to scale) or RTS_CRS (constant returns to scale). Defaults to RTS_VRS.
         """
         # TODO(error/warning handling): Check the configuration of the model exist
-        self.cutactive = sweet.sweet(np.column_stack(x,b))
         self.y, self.x, self.b, self.z,self.gy, self.gx, self.gb = \
             tools.assert_valid_direciontal_data_with_z(y,x,b,z,gy,gx,gb)
+        self.cutactive = sweet.sweet(np.hstack((self.x, self.b)))
 
 
         self.fun = fun
@@ -238,11 +237,7 @@ class CNLSDDFG:
     def get_beta(self):
         """Return beta value by array"""
         tools.assert_optimized(self.optimization_status)
-        beta = np.asarray([i + tuple([j]) for i, j in zip(list(self.__model__.beta),
-                                                          list(self.__model__.beta[:, :].value))])
-        beta = pd.DataFrame(beta, columns=['Name', 'Key', 'Value'])
-        beta = beta.pivot(index='Name', columns='Key', values='Value')
-        return beta.to_numpy()
+        return tools.to_2d_array(self.__model__.beta)
 
     def get_residual(self):
         """Return residual value by array"""
@@ -267,18 +262,10 @@ class CNLSDDFG:
         """Return delta value by array"""
         tools.assert_optimized(self.optimization_status)
         tools.assert_undesirable_output(self.b)
-        delta = np.asarray([i + tuple([j]) for i, j in zip(list(self.__model__.delta),
-                                                           list(self.__model__.delta[:, :].value))])
-        delta = pd.DataFrame(delta, columns=['Name', 'Key', 'Value'])
-        delta = delta.pivot(index='Name', columns='Key', values='Value')
-        return delta.to_numpy()
+        return tools.to_2d_array(self.__model__.delta)
 
     def get_gamma(self):
         """Return gamma value by array"""
         tools.assert_optimized(self.optimization_status)
         tools.assert_desirable_output(self.y)
-        gamma = np.asarray([i + tuple([j]) for i, j in zip(list(self.__model__.gamma),
-                                                           list(self.__model__.gamma[:, :].value))])
-        gamma = pd.DataFrame(gamma, columns=['Name', 'Key', 'Value'])
-        gamma = gamma.pivot(index='Name', columns='Key', values='Value')
-        return gamma.to_numpy()
\ No newline at end of file
+        return tools.to_2d_array(self.__model__.gamma)
\ No newline at end of file
@@ -1,6 +1,5 @@
 # import dependencies
 import numpy as np
-import pandas as pd
 from .utils import CQERG1, CQERG2, CQERZG1, CQERZG2, sweet, tools, interpolation
 from .constant import CET_ADDI, CET_MULT, FUN_PROD, FUN_COST, RTS_CRS, RTS_VRS, OPT_LOCAL, OPT_DEFAULT
 import time
@@ -172,11 +171,7 @@ class CQRG:
     def get_beta(self):
         """Return beta value by array"""
         tools.assert_optimized(self.optimization_status)
-        beta = np.asarray([i + tuple([j]) for i, j in zip(list(self.__model__.beta),
-                                                          list(self.__model__.beta[:, :].value))])
-        beta = pd.DataFrame(beta, columns=['Name', 'Key', 'Value'])
-        beta = beta.pivot(index='Name', columns='Key', values='Value')
-        return beta.to_numpy()
+        return tools.to_2d_array(self.__model__.beta)
 
     def get_residual(self):
         """Return residual value by array"""
@@ -405,11 +400,7 @@ class CERG:
     def get_beta(self):
         """Return beta value by array"""
         tools.assert_optimized(self.optimization_status)
-        beta = np.asarray([i + tuple([j]) for i, j in zip(list(self.__model__.beta),
-                                                          list(self.__model__.beta[:, :].value))])
-        beta = pd.DataFrame(beta, columns=['Name', 'Key', 'Value'])
-        beta = beta.pivot(index='Name', columns='Key', values='Value')
-        return beta.to_numpy()
+        return tools.to_2d_array(self.__model__.beta)
 
     def get_residual(self):
         """Return residual value by array"""
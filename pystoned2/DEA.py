@@ -1,7 +1,6 @@
 # import dependencies
 from pyomo.environ import ConcreteModel, Set, Var, Objective, minimize, maximize, Constraint
 import numpy as np
-import pandas as pd
 from .constant import CET_ADDI, ORIENT_IO, ORIENT_OO, RTS_VRS, RTS_CRS, OPT_DEFAULT, OPT_LOCAL
 from .utils import tools
 
@@ -136,11 +135,7 @@ class DEA:
     def get_lamda(self):
         """Return lamda value by array"""
         tools.assert_optimized(self.optimization_status)
-        lamda = np.asarray([i + tuple([j]) for i, j in zip(list(self.__model__.lamda),
-                                                          list(self.__model__.lamda[:, :].value))])
-        lamda = pd.DataFrame(lamda, columns=['Name', 'Key', 'Value'])
-        lamda = lamda.pivot(index='Name', columns='Key', values='Value')
-        return lamda.to_numpy()
+        return tools.to_2d_array(self.__model__.lamda)
 
 
 class DDF(DEA):
@@ -355,20 +350,12 @@ class DUAL(DEA):
     def get_mu(self):
         """Return mu value by array"""
         tools.assert_optimized(self.optimization_status)
-        mu = np.asarray([i + tuple([j]) for i, j in zip(list(self.__model__.mu),
-                                                          list(self.__model__.mu[:, :].value))])
-        mu = pd.DataFrame(mu, columns=['Name', 'Key', 'Value'])
-        mu = mu.pivot(index='Name', columns='Key', values='Value')
-        return mu.to_numpy()
+        return tools.to_2d_array(self.__model__.mu)
 
     def get_nu(self):
         """Return nu value by array"""
         tools.assert_optimized(self.optimization_status)
-        nu = np.asarray([i + tuple([j]) for i, j in zip(list(self.__model__.nu),
-                                                          list(self.__model__.nu[:, :].value))])
-        nu = pd.DataFrame(nu, columns=['Name', 'Key', 'Value'])
-        nu = nu.pivot(index='Name', columns='Key', values='Value')
-        return nu.to_numpy()
+        return tools.to_2d_array(self.__model__.nu)
 
     def get_omega(self):
         """Return omega value by array"""
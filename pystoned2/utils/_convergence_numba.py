@@ -0,0 +1,97 @@
+# import dependencies
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def convergence_test(alpha, beta, delta, x, b, rts_code, fun_code, active2, active):
+        """Find the violated concavity constraints of weakCNLSG
+
+        Args:
+            alpha (ndarray): alpha estimates, ignored if rts_code is 0.
+            beta (ndarray): beta estimates.
+            delta (ndarray): delta estimates.
+            x (ndarray): input variables.
+            b (ndarray): undesirable variables.
+            rts_code (int): 1 for RTS_VRS and 0 for RTS_CRS.
+            fun_code (int): 1 for FUN_PROD and -1 for FUN_COST.
+            active2 (ndarray): violated concavity constraint, written in place.
+            active (ndarray): boolean mask of the active concavity constraint, updated in place.
+
+        Returns:
+            float: maximal violation.
+        """
+        n = x.shape[0]
+        row_max = np.zeros(n)
+        for i in prange(n):
+            own = 0.0
+            for k in range(x.shape[1]):
+                own += beta[i, k] * x[i, k]
+            for l in range(b.shape[1]):
+                own += delta[i, l] * b[i, l]
+            activetmp = 0.0
+            for j in range(n):
+                cross = 0.0
+                for k in range(x.shape[1]):
+                    cross += beta[j, k] * x[i, k]
+                for l in range(b.shape[1]):
+                    cross += delta[j, l] * b[i, l]
+                value = own - cross
+                if rts_code == 1:
+                    value += alpha[i] - alpha[j]
+                value *= fun_code
+                active2[i, j] = value
+                if value > activetmp:
+                    activetmp = value
+            # find the maximal violated constraint in sub-loop and added into the active matrix
+            if activetmp > 0:
+                for j in range(n):
+                    if active2[i, j] >= activetmp:
+                        active[i, j] = True
+            row_max[i] = activetmp
+        return row_max.max()
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def convergence_test_weak(alpha, beta, x, rts_code, fun_code, activeweak2, activeweak):
+        """Find the violated weak disposability constraints of weakCNLSG
+
+        Args:
+            alpha (ndarray): alpha estimates, ignored if rts_code is 0.
+            beta (ndarray): beta estimates.
+            x (ndarray): input variables.
+            rts_code (int): 1 for RTS_VRS and 0 for RTS_CRS.
+            fun_code (int): 1 for FUN_PROD and -1 for FUN_COST.
+            activeweak2 (ndarray): violated weak disposability constraint, written in place.
+            activeweak (ndarray): boolean mask of the active weak disposability constraint, updated in place.
+
+        Returns:
+            float: maximal violation.
+        """
+        n = x.shape[0]
+        row_max = np.zeros(n)
+        for i in prange(n):
+            activetmp = 0.0
+            for j in range(n):
+                cross = 0.0
+                for k in range(x.shape[1]):
+                    cross += beta[j, k] * x[i, k]
+                if rts_code == 1:
+                    cross += alpha[j]
+                value = - fun_code * cross
+                activeweak2[i, j] = value
+                if value > activetmp:
+                    activetmp = value
+            # find the maximal violated constraint in sub-loop and added into the active matrix
+            if activetmp > 0:
+                for j in range(n):
+                    if activeweak2[i, j] >= activetmp:
+                        activeweak[i, j] = True
+            row_max[i] = activetmp
+        return row_max.max()
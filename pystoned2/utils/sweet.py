@@ -33,3 +33,16 @@ def sweet(x):
                 cutactive[i, j] = 1
 
     return to_2d_list(trans_list(cutactive))
+
+
+def sweet_pairs(cutactive):
+    """Pairs of the active concavity constraint in sweet spot
+
+    Args:
+        cutactive (list or ndarray): active concavity constraint.
+
+    Returns:
+        list: (i, h) pairs with cutactive[i][h] set and i != h.
+    """
+    rows, cols = np.nonzero(np.asarray(cutactive))
+    return [(i, h) for i, h in zip(rows.tolist(), cols.tolist()) if i != h]
@@ -5,6 +5,8 @@ import numpy as np
 from pyomo.opt import SolverFactory, SolverManagerFactory
 from ..constant import CET_ADDI, CET_MULT, CET_Model_Categories, OPT_LOCAL, OPT_DEFAULT, RTS_CRS
 __email_re = compile(r'([^@]+@[^@]+\.[a-zA-Z0-9]+)$')
+# option name of the thread count of the in-process solvers
+__thread_option = {'mosek': 'MSK_IPAR_NUM_THREADS', 'gurobi': 'Threads', 'cplex': 'threads'}
 
 
 def set_neos_email(address):
@@ -22,7 +24,7 @@ def set_neos_email(address):
     return True
 
 
-def optimize_model(model, email, cet, solver=OPT_DEFAULT):
+def optimize_model(model, email, cet, solver=OPT_DEFAULT, threads=None):
     if not set_neos_email(email):
         if solver is not OPT_DEFAULT:
             assert_solver_available_locally(solver)
@@ -32,6 +34,8 @@ def optimize_model(model, email, cet, solver=OPT_DEFAULT):
             raise ValueError(
                 "Please specify the solver for optimizing multiplicative model locally.")
         solver_instance = SolverFactory(solver)
+        if threads is not None and solver in __thread_option:
+            solver_instance.options[__thread_option[solver]] = threads
         print("Estimating the {} locally with {} solver.".format(
             CET_Model_Categories[cet], solver), flush=True)
         return solver_instance.solve(model, tee=True), 1
@@ -72,6 +76,22 @@ def to_2d_list(li):
     return li
 
 
+def to_2d_array(var):
+    """Return the value of a variable indexed by two sets by array
+
+    Args:
+        var (Var): pyomo variable indexed by (I, J) with I = range(n) and J = range(k).
+
+    Returns:
+        ndarray: n*k array of the variable value, with nan for the unset value.
+    """
+    # the variable iterates over I x J in row-major order of the ordered sets
+    I, J = var.index_set().subsets()
+    value = np.fromiter((np.nan if v.value is None else v.value for v in var.values()),
+                        dtype=np.float64, count=len(I) * len(J))
+    return value.reshape(len(I), len(J))
+
+
 def assert_valid_basic_data(y, x, z=None):
     y = trans_list(y)
     x = trans_list(x)
@@ -2,9 +2,8 @@
 from pyomo.environ import ConcreteModel, Set, Var, Objective, minimize, Constraint, log
 from pyomo.core.expr.numvalue import NumericValue
 import numpy as np
-import pandas as pd
 from ..constant import CET_ADDI, CET_MULT, FUN_PROD, FUN_COST, RTS_CRS, RTS_VRS, OPT_DEFAULT, OPT_LOCAL
-from .tools import optimize_model, trans_list, to_2d_list
+from .tools import optimize_model, to_2d_array
 
 
 class weakCNLSZG2:
@@ -20,8 +19,8 @@ class weakCNLSZG2:
             b (float): undersiable variables.
             z (float, optional): Contextual variable(s). Defaults to None.
             cutactive (float or list): active concavity constraint.
-            active (float or ndarray): violated concavity constraint.
-            activeweak (float or ndarray): violated concavity constraint for weak disposibility.
+            active (ndarray): boolean mask of the violated concavity constraint.
+            activeweak (ndarray): boolean mask of the violated concavity constraint for weak disposibility.
             cet (String, optional): CET_ADDI (additive composite error term) or CET_MULT (multiplicative composite error term). Defaults to CET_ADDI.
             fun (String, optional): FUN_PROD (production frontier) or FUN_COST (cost frontier). Defaults to FUN_PROD.
             rts (String, optional): RTS_VRS (variable returns to scale) or RTS_CRS (constant returns to scale). Defaults to RTS_VRS.
@@ -36,8 +35,8 @@ class weakCNLSZG2:
         self.rts = rts
 
         self.cutactive = cutactive
-        self.active = to_2d_list(trans_list(active))
-        self.activeweak = to_2d_list(trans_list(activeweak))
+        self.active = np.asarray(active, dtype=bool).tolist()
+        self.activeweak = np.asarray(activeweak, dtype=bool).tolist()
 
         # Initialize the CNLS model
         self.__model__ = ConcreteModel()
@@ -98,16 +97,17 @@ class weakCNLSZG2:
         self.optimization_status = 0
         self.problem_status = 0
 
-    def optimize(self, email=OPT_LOCAL, solver=OPT_DEFAULT):
+    def optimize(self, email=OPT_LOCAL, solver=OPT_DEFAULT, threads=None):
         """Optimize the function by requested method
 
         Args:
             email (string): The email address for remote optimization. It will optimize locally if OPT_LOCAL is given.
             solver (string): The solver chosen for optimization. It will optimize with default solver if OPT_DEFAULT is given.
+            threads (int, optional): Number of threads of the local solver. Defaults to None (solver default).
         """
         # TODO(error/warning handling): Check problem status after optimization
         self.problem_status, self.optimization_status = optimize_model(
-            self.__model__, email, self.cet, solver)
+            self.__model__, email, self.cet, solver, threads)
 
     def __objective_rule(self):
         """Return the proper objective function"""
@@ -333,18 +333,10 @@ class weakCNLSZG2:
         """Return beta value by array"""
         if self.optimization_status == 0:
             self.optimize()
-        beta = np.asarray([i + tuple([j]) for i, j in zip(list(self.__model__.beta),
-                                                          list(self.__model__.beta[:, :].value))])
-        beta = pd.DataFrame(beta, columns=['Name', 'Key', 'Value'])
-        beta = beta.pivot(index='Name', columns='Key', values='Value')
-        return beta.to_numpy()
+        return to_2d_array(self.__model__.beta)
 
     def get_delta(self):
         """Return delta value by array"""
         if self.optimization_status == 0:
             self.optimize()
-        delta = np.asarray([i + tuple([j]) for i, j in zip(list(self.__model__.delta),
-                                                           list(self.__model__.delta[:, :].value))])
-        delta = pd.DataFrame(delta, columns=['Name', 'Key', 'Value'])
-        delta = delta.pivot(index='Name', columns='Key', values='Value')
-        return delta.to_numpy()
\ No newline at end of file
+        return to_2d_array(self.__model__.delta)
\ No newline at end of file
@@ -1,10 +1,10 @@
 # import dependencies
-from pyomo.environ import ConcreteModel, Set, Var, Objective, minimize, Constraint, log
+from pyomo.environ import ConcreteModel, Set, Var, Objective, minimize, Constraint, log, quicksum
 from pyomo.core.expr.numvalue import NumericValue
 import numpy as np
-import pandas as pd
 from ..constant import CET_ADDI, CET_MULT, FUN_PROD, FUN_COST, RTS_CRS, RTS_VRS, OPT_DEFAULT, OPT_LOCAL
-from .tools import optimize_model
+from .tools import optimize_model, to_2d_array
+from .sweet import sweet_pairs
 
 
 class weakCNLSxG1:
@@ -33,22 +33,27 @@ class weakCNLSxG1:
 
         self.cutactive = cutactive
 
+        # numeric copies of y and b used to build the constraints
+        self._y = np.ascontiguousarray(y, dtype=np.float64).reshape(len(y), -1)
+        self._b = np.ascontiguousarray(b, dtype=np.float64).reshape(len(b), -1)
+
         # Initialize the CNLS model
         self.__model__ = ConcreteModel()
 
         # Initialize the sets
         self.__model__.I = Set(initialize=range(len(self.x))) #i行
-        self.__model__.J = Set(initialize=range(len(self.y[0]))) #j个y
-        self.__model__.L = Set(initialize=range(len(self.b[0])))  # l个b
+        self.__model__.J = Set(initialize=range(self._y.shape[1])) #j个y
+        self.__model__.L = Set(initialize=range(self._b.shape[1]))  # l个b
+        self.__model__.SWEET = Set(initialize=sweet_pairs(self.cutactive), dimen=2)  # (i,h) in sweet spot
 
         # Initialize the variables
         self.__model__.alpha = Var(self.__model__.I, doc='alpha')
         self.__model__.delta = Var(self.__model__.I,
-                                  self.__model__.J,
+                                  self.__model__.L,
                                   bounds=(0.0, None),
                                   doc='delta')
         self.__model__.gamma = Var(self.__model__.I,
-                                   self.__model__.L,
+                                   self.__model__.J,
                                    bounds=(0.0, None),
                                    doc='gamma')
         self.__model__.epsilon = Var(self.__model__.I, doc='residual')
@@ -74,8 +79,7 @@ class weakCNLSxG1:
                                                         self.__model__.I,
                                                         rule=self.__disposability_rule(),
                                                         doc='weak disposibility')
-        self.__model__.sweet_rule = Constraint(self.__model__.I,
-                                               self.__model__.I,
+        self.__model__.sweet_rule = Constraint(self.__model__.SWEET,
                                                rule=self.__sweet_rule(),
                                                doc='sweet spot approach')
 
@@ -109,16 +113,16 @@ class weakCNLSxG1:
 
                 def regression_rule(model, i):
                     return self.x[i] == - model.alpha[i] \
-                        + sum(model.gamma[i, j] * self.y[i][j] for j in model.J) \
-                        - sum(model.delta[i, l] * self.b[i][l] for l in model.L) \
+                        + quicksum(model.gamma[i, j] * float(self._y[i, j]) for j in model.J) \
+                        - quicksum(model.delta[i, l] * float(self._b[i, l]) for l in model.L) \
                         - model.epsilon[i]
 
                 return regression_rule
             elif self.rts == RTS_CRS:
 
                 def regression_rule(model, i):
-                    return self.x[i] == sum(model.gamma[i, j] * self.y[i][j] for j in model.J) \
-                        - sum(model.delta[i, l] * self.b[i][l] for l in model.L) \
+                    return self.x[i] == quicksum(model.gamma[i, j] * float(self._y[i, j]) for j in model.J) \
+                        - quicksum(model.delta[i, l] * float(self._b[i, l]) for l in model.L) \
                         - model.epsilon[i]
 
                 return regression_rule
@@ -139,17 +143,17 @@ class weakCNLSxG1:
             if self.rts == RTS_VRS:
 
                 def log_rule(model, i):
-                    return model.frontier[i] == model.alpha[i] - sum(
-                        model.gamma[i, j] * self.y[i][j] for j in model.J) \
-                            + sum(model.delta[i, l] * self.b[i][l] for l in model.L) - 1
+                    return model.frontier[i] == model.alpha[i] - quicksum(
+                        model.gamma[i, j] * float(self._y[i, j]) for j in model.J) \
+                            + quicksum(model.delta[i, l] * float(self._b[i, l]) for l in model.L) - 1
 
                 return log_rule
             elif self.rts == RTS_CRS:
 
                 def log_rule(model, i):
-                    return model.frontier[i] == - sum(
-                        model.gamma[i, j] * self.y[i][j] for j in model.J) \
-                            + sum(model.delta[i, l] * self.b[i][l] for l in model.L) - 1
+                    return model.frontier[i] == - quicksum(
+                        model.gamma[i, j] * float(self._y[i, j]) for j in model.J) \
+                            + quicksum(model.delta[i, l] * float(self._b[i, l]) for l in model.L) - 1
 
                 return log_rule
 
@@ -166,21 +170,21 @@ class weakCNLSxG1:
 
             def afriat_rule(model, i):
                 return __operator(
-                    model.alpha[i] + sum(model.delta[i, l] * self.b[i][l]for l in model.L) \
-                                   - sum(model.gamma[i, j] * self.y[i][j] for j in model.J),
+                    model.alpha[i] + quicksum(model.delta[i, l] * float(self._b[i, l]) for l in model.L) \
+                                   - quicksum(model.gamma[i, j] * float(self._y[i, j]) for j in model.J),
                     model.alpha[self.__model__.I.nextw(i)] \
-                           + sum(model.delta[self.__model__.I.nextw(i), l] * self.x[i][l]for l in model.L) \
-                        - sum(model.gamma[self.__model__.I.nextw(i), j] * self.y[i][j] for j in model.J))
+                           + quicksum(model.delta[self.__model__.I.nextw(i), l] * float(self._b[i, l]) for l in model.L) \
+                        - quicksum(model.gamma[self.__model__.I.nextw(i), j] * float(self._y[i, j]) for j in model.J))
 
             return afriat_rule
 
         elif self.rts == RTS_CRS:
             def afriat_rule(model, i):
                 return __operator(
-                    sum(model.delta[i, l] * self.b[i][l]for l in model.L) \
-                                   - sum(model.gamma[i, j] * self.y[i][j] for j in model.J),
-                    sum(model.delta[self.__model__.I.nextw(i), l] * self.x[i][l]for l in model.L) \
-                        - sum(model.gamma[self.__model__.I.nextw(i), j] * self.y[i][j] for j in model.J))
+                    quicksum(model.delta[i, l] * float(self._b[i, l]) for l in model.L) \
+                                   - quicksum(model.gamma[i, j] * float(self._y[i, j]) for j in model.J),
+                    quicksum(model.delta[self.__model__.I.nextw(i), l] * float(self._b[i, l]) for l in model.L) \
+                        - quicksum(model.gamma[self.__model__.I.nextw(i), j] * float(self._y[i, j]) for j in model.J))
 
             return afriat_rule
         raise ValueError("Undefined model parameters.")
@@ -210,29 +214,21 @@ class weakCNLSxG1:
         if self.rts == RTS_VRS:
 
             def sweet_rule(model, i, h):
-                if self.cutactive[i][h]:
-                    if i == h:
-                        return Constraint.Skip
-                    return __operator(model.alpha[i] \
-                                      - sum(model.gamma[i, j] * self.y[i][j] for j in model.J) \
-                                      + sum(model.delta[i, l] * self.b[i][l] for l in model.L),
-                                      model.alpha[h] \
-                                      - sum(model.gamma[h, j] * self.y[i][j] for j in model.J) \
-                                      + sum(model.delta[h, l] * self.b[i][l] for l in model.L) )
-                return Constraint.Skip
+                return __operator(model.alpha[i] \
+                                  - quicksum(model.gamma[i, j] * float(self._y[i, j]) for j in model.J) \
+                                  + quicksum(model.delta[i, l] * float(self._b[i, l]) for l in model.L),
+                                  model.alpha[h] \
+                                  - quicksum(model.gamma[h, j] * float(self._y[i, j]) for j in model.J) \
+                                  + quicksum(model.delta[h, l] * float(self._b[i, l]) for l in model.L) )
 
             return sweet_rule
         elif self.rts == RTS_CRS:
 
             def sweet_rule(model, i, h):
-                if self.cutactive[i][h]:
-                    if i == h:
-                        return Constraint.Skip
-                    return __operator(- sum(model.gamma[i, j] * self.y[i][j] for j in model.J) \
-                                      + sum(model.delta[i, l] * self.b[i][l] for l in model.L),
-                                      - sum(model.gamma[h, j] * self.y[i][j] for j in model.J) \
-                                      + sum(model.delta[h, l] * self.b[i][l] for l in model.L) )
-                return Constraint.Skip
+                return __operator(- quicksum(model.gamma[i, j] * float(self._y[i, j]) for j in model.J) \
+                                  + quicksum(model.delta[i, l] * float(self._b[i, l]) for l in model.L),
+                                  - quicksum(model.gamma[h, j] * float(self._y[i, j]) for j in model.J) \
+                                  + quicksum(model.delta[h, l] * float(self._b[i, l]) for l in model.L) )
 
             return sweet_rule
 
@@ -249,18 +245,10 @@ class weakCNLSxG1:
         """Return delta value by array"""
         if self.optimization_status == 0:
             self.optimize()
-        delta = np.asarray([i + tuple([j]) for i, j in zip(list(self.__model__.delta),
-                                                          list(self.__model__.delta[:, :].value))])
-        delta = pd.DataFrame(delta, columns=['Name', 'Key', 'Value'])
-        delta = delta.pivot(index='Name', columns='Key', values='Value')
-        return delta.to_numpy()
+        return to_2d_array(self.__model__.delta)
 
     def get_gamma(self):
         """Return gamma value by array"""
         if self.optimization_status == 0:
             self.optimize()
-        gamma = np.asarray([i + tuple([j]) for i, j in zip(list(self.__model__.gamma),
-                                                           list(self.__model__.gamma[:, :].value))])
-        gamma = pd.DataFrame(gamma, columns=['Name', 'Key', 'Value'])
-        gamma = gamma.pivot(index='Name', columns='Key', values='Value')
-        return gamma.to_numpy()
\ No newline at end of file
+        return to_2d_array(self.__model__.gamma)
\ No newline at end of file
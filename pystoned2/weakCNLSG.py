@@ -1,16 +1,59 @@
 # import dependencies
 import numpy as np
-import pandas as pd
-from .utils import weakCNLSG1, weakCNLSG2, weakCNLSZG1, weakCNLSZG2, sweet, tools, interpolation
-from .constant import CET_ADDI, CET_MULT, FUN_PROD, FUN_COST, OPT_DEFAULT, RTS_CRS, RTS_VRS,OPT_LOCAL
+from .utils import weakCNLSG1, weakCNLSG2, weakCNLSZG1, weakCNLSZG2, sweet, tools, interpolation, _convergence_numba
+from .constant import CET_ADDI, CET_MULT, FUN_PROD, FUN_COST, OPT_DEFAULT, RTS_VRS,OPT_LOCAL
 import time
+from os import environ
+from concurrent.futures import ProcessPoolExecutor
 
 
 
+def _row_dot(A, B):
+    """Return the row-wise inner products A[i]B[i]"""
+    return np.einsum('ij,ij->i', A, B)
+
+
+def _optimize_model2(y, x, b, z, cutactive, active, activeweak, cet, fun, rts, email, solver, threads=None):
+    """Build and solve the weakCNLSG model in iterative loop"""
+    if type(z) != type(None):
+        model2 = weakCNLSZG2.weakCNLSZG2(
+            y, x, b, z, cutactive, active, activeweak, cet, fun, rts)
+    else:
+        model2 = weakCNLSG2.weakCNLSG2(
+            y, x, b, cutactive, active, activeweak, cet, fun, rts)
+    model2.optimize(email, solver, threads)
+    return model2
+
+
+def _solve_candidate(args):
+    """Solve one candidate active set in a worker process and return (alpha, beta, delta)"""
+    model2 = _optimize_model2(*args, threads=1)
+    return model2.get_alpha(), model2.get_beta(), model2.get_delta()
+
+
+def _limit_solver_threads():
+    """Ask the solvers started as subprocesses by each worker to run single-threaded
+
+    The variables only reach the processes the worker starts afterwards. NumPy
+    and the in-process solvers (e.g. MOSEK) are loaded before the initializer
+    runs and ignore them, the thread count of the latter is set through the
+    solver options by _solve_candidate instead.
+    """
+    for name in ['OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS']:
+        environ[name] = '1'
+
 
 class weakCNLSG:
     """Convex Nonparametric Least Square with weak disposability (weakCNLS) and Genetic algorithm
     """
+    # run the convergence tests with the numba kernels if numba is installed
+    numba_convergence = False
+    # compute the violation matrices in float32 to halve the memory traffic. The rounding
+    # error grows with the magnitude of the estimates and can exceed the 1e-4 tolerance
+    # (about 2e-4 for fitted values around 1e3), the iterations then stop once the test
+    # adds no new active constraint instead of once the violation is below the tolerance
+    low_precision_convergence = False
+
     def __init__(self, y, x, b, z=None, cet=CET_ADDI, fun=FUN_PROD, rts=RTS_VRS):
         """weakCNLSG model
 
@@ -24,21 +67,25 @@ class weakCNLSG:
             rts (String, optional): RTS_VRS (variable returns to scale) or RTS_CRS (constant returns to scale). Defaults to RTS_VRS.
         """
         # TODO(error/warning handling): Check the configuration of the model exist
-        self.cutactive = sweet.sweet(np.column_stack(x,b))
         self.y, self.x, self.b, self.z = tools.assert_valid_wp_data(y, x, b, z)
+        # contiguous copies of the data for the convergence test
+        self._x_np = np.ascontiguousarray(self.x, dtype=np.float64)
+        self._b_np = np.ascontiguousarray(self.b, dtype=np.float64)
+        self.cutactive = sweet.sweet(np.hstack((self._x_np, self._b_np)))
         self.cet = cet
         self.fun = fun
         self.rts = rts
 
+        n = self._x_np.shape[0]
         # active (added) violated concavity constraint by iterative procedure
-        self.active = np.zeros((len(x), len(x)))
+        self.active = np.zeros((n, n), dtype=bool)
         # violated concavity constraint
-        self.active2 = np.zeros((len(x), len(x)))
+        self.active2 = np.empty((n, n))
 
         # active (added) violated concavity constraint for weak disposbility constrains by iterative procedure
-        self.activeweak = np.zeros((len(x), len(x)))
+        self.activeweak = np.zeros((n, n), dtype=bool)
         # violated concavity constraint for weak disposbility constrains
-        self.activeweak2 = np.zeros((len(x), len(x)))
+        self.activeweak2 = np.empty((n, n))
 
         # Optimize model
         self.optimization_status = 0
@@ -46,8 +93,14 @@ class weakCNLSG:
 
 
 
-    def optimize(self, email=OPT_LOCAL, solver=OPT_DEFAULT):
-        """Optimize the function by requested method"""
+    def optimize(self, email=OPT_LOCAL, solver=OPT_DEFAULT, n_jobs=1):
+        """Optimize the function by requested method
+
+        Args:
+            email (string): The email address for remote optimization. It will optimize locally if OPT_LOCAL is given.
+            solver (string): The solver chosen for optimization. It will optimize with default solver if OPT_DEFAULT is given.
+            n_jobs (int, optional): Number of candidate active sets solved in parallel per iteration, each by a single-threaded solver. Defaults to 1.
+        """
         # TODO(error/warning handling): Check problem status after optimization
         self.t0 = time.time()
         if type(self.z) != type(None):
@@ -63,189 +116,144 @@ class weakCNLSG:
         self.__model__ = model1.__model__
 
         self.count = 0
-        while self.__convergence_test(self.alpha, self.beta, self.delta) > 0.0001 \
-                or self.__convergence_test_weak(self.alpha, self.beta, self.delta) > 0.0001:
-            if type(self.z) != type(None):
-                model2 = weakCNLSZG2.weakCNLSZG2(
-                    self.y, self.x, self.b, self.z,self.cutactive, self.active,self.activeweak,
-                        self.cet, self.fun, self.rts)
-            else:
-                model2 = weakCNLSG2.weakCNLSG2(
-                    self.y, self.x, self.b, self.cutactive, self.active,self.activeweak,
-                        self.cet, self.fun, self.rts)
-            model2.optimize(email, solver)
+        if n_jobs > 1:
+            self.__optimize_parallel(email, solver, n_jobs)
+        else:
+            while self.__violated(self.alpha, self.beta, self.delta):
+                model2 = _optimize_model2(self.y, self.x, self.b, self.z, self.cutactive,
+                                          self.active, self.activeweak, self.cet, self.fun, self.rts,
+                                          email, solver)
+                self.alpha = model2.get_alpha()
+                self.beta = model2.get_beta()
+                self.delta = model2.get_delta()
+                # TODO: Replace print with log system
+                # print("Genetic Algorithm Convergence : %8f" %
+                #       (self.__convergence_test(self.alpha, self.beta)))
+                self.__model__ = model2.__model__
+                self.count += 1
+        self.optimization_status = 1
+        self.tt = time.time() - self.t0
+
+    def __optimize_parallel(self, email, solver, n_jobs):
+        """Solve n_jobs candidate active sets per iteration and keep the best one
+
+        Candidate k adds the k+1 largest violated constraints of each row, so
+        candidate 0 is the active set of the sequential procedure.
+        """
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_limit_solver_threads) as executor:
+            while True:
+                solved = self.active.copy(), self.activeweak.copy()
+                if max(self._run_convergence(self.alpha, self.beta, self.delta)) <= 0.0001:
+                    break
+                candidates = [(self.__add_candidate(self.active2, self.active, k + 1),
+                               self.__add_candidate(self.activeweak2, self.activeweak, k + 1))
+                              for k in range(n_jobs)]
+                results = list(executor.map(_solve_candidate, [
+                    (self.y, self.x, self.b, self.z, self.cutactive, active, activeweak,
+                     self.cet, self.fun, self.rts, email, solver) for active, activeweak in candidates]))
+
+                # keep the candidate with the smallest remaining violation
+                violation = []
+                for alpha, beta, delta in results:
+                    self.__fill_violation(alpha, beta, delta)
+                    violation.append(max(float(self.active2.max()), float(self.activeweak2.max())))
+                best = int(np.argmin(violation))
+                if np.array_equal(candidates[best][0], solved[0]) and np.array_equal(candidates[best][1], solved[1]):
+                    # the best candidate is the active set already solved, see __violated
+                    break
+                self.active, self.activeweak = candidates[best]
+                self.alpha, self.beta, self.delta = results[best]
+                self.count += 1
+
+        if self.count > 0:
+            # the Pyomo model cannot leave the worker, so rebuild the accepted iterate locally
+            model2 = _optimize_model2(self.y, self.x, self.b, self.z, self.cutactive,
+                                      self.active, self.activeweak, self.cet, self.fun, self.rts,
+                                      email, solver)
             self.alpha = model2.get_alpha()
             self.beta = model2.get_beta()
             self.delta = model2.get_delta()
-            # TODO: Replace print with log system
-            # print("Genetic Algorithm Convergence : %8f" %
-            #       (self.__convergence_test(self.alpha, self.beta)))
             self.__model__ = model2.__model__
-            self.count += 1
-        self.optimization_status = 1
-        self.tt = time.time() - self.t0
 
-    def __convergence_test(self, alpha, beta,delta):
-        x = np.asarray(self.x)
-        b = np.asarray(self.b)
-        activetmp1 = 0.0
-        if self.rts == RTS_VRS and self.fun == FUN_PROD:
-        # go into the loop
-            for i in range(len(x)):
-                activetmp = 0.0
-                # go into the sub-loop and find the violated concavity constraints
-                for j in range(len(x)):
-                    self.active2[i, j] = alpha[i] \
-                        + np.sum(beta[i, :] * x[i, :]) + np.sum(delta[i, :] * b[i, :]) - \
-                        alpha[j] - np.sum(beta[j, :] * x[i, :]) - np.sum(delta[j, :] * b[i, :])
-
-                    if self.active2[i, j] > activetmp:
-                        activetmp = self.active2[i, j]
-
-            # find the maximal violated constraint in sub-loop and added into the active matrix
-                for j in range(len(x)):
-                    if self.active2[i, j] >= activetmp and activetmp > 0:
-                        self.active[i, j] = 1
-                if activetmp > activetmp1:
-                    activetmp1 = activetmp
-
-
-        elif self.rts == RTS_VRS and self.fun == FUN_COST:
-        # go into the loop
-            for i in range(len(x)):
-                activetmp = 0.0
-                # go into the sub-loop and find the violated concavity constraints
-                for j in range(len(x)):
-                    self.active2[i, j] = - alpha[i] - np.sum(beta[i, :] * x[i, :]) \
-                                         - np.sum(delta[i, :] * b[i, :])+ alpha[j] \
-                                         + np.sum(beta[j, :] * x[i, :]) + np.sum(delta[j, :] * b[i, :])
-
-                    if self.active2[i, j] > activetmp:
-                        activetmp = self.active2[i, j]
-
-            # find the maximal violated constraint in sub-loop and added into the active matrix
-                for j in range(len(x)):
-                    if self.active2[i, j] >= activetmp and activetmp > 0:
-                        self.active[i, j] = 1
-                if activetmp > activetmp1:
-                    activetmp1 = activetmp
-
-
-        elif self.rts == RTS_CRS and self.fun == FUN_PROD:
-        # go into the loop
-            for i in range(len(x)):
-                activetmp = 0.0
-                # go into the sub-loop and find the violated concavity constraints
-                for j in range(len(x)):
-                    self.active2[i, j] = np.sum(beta[i, :] * x[i, :]) + np.sum(delta[i, :] * b[i, :]) \
-                            - np.sum(beta[j, :] * x[i, :]) - np.sum(delta[j, :] * b[i, :])
-
-                    if self.active2[i, j] > activetmp:
-                        activetmp = self.active2[i, j]
-
-            # find the maximal violated constraint in sub-loop and added into the active matrix
-                for j in range(len(x)):
-                    if self.active2[i, j] >= activetmp and activetmp > 0:
-                        self.active[i, j] = 1
-                if activetmp > activetmp1:
-                    activetmp1 = activetmp
-
-        elif self.rts == RTS_CRS and self.fun == FUN_COST:
-        # go into the loop
-            for i in range(len(x)):
-                activetmp = 0.0
-                # go into the sub-loop and find the violated concavity constraints
-                for j in range(len(x)):
-                    self.active2[i, j] = - np.sum(beta[i, :] * x[i, :]) - np.sum(delta[i, :] * b[i, :]) \
-                            + np.sum(beta[j, :] * x[i, :]) + np.sum(delta[j, :] * b[i, :])
-                    if self.active2[i, j] > activetmp:
-                        activetmp = self.active2[i, j]
-
-            # find the maximal violated constraint in sub-loop and added into the active matrix
-                for j in range(len(x)):
-                    if self.active2[i, j] >= activetmp and activetmp > 0:
-                        self.active[i, j] = 1
-                if activetmp > activetmp1:
-                    activetmp1 = activetmp
-        return activetmp
-
-
-
-    def __convergence_test_weak(self, alpha, beta,delta):
-        x = np.asarray(self.x)
-        b = np.asarray(self.b)
-        activetmp1 = 0.0
-        if self.rts == RTS_VRS and self.fun == FUN_PROD:
-        # go into the loop
-            for i in range(len(x)):
-                activetmp = 0.0
-                # go into the sub-loop and find the violated concavity constraints
-                for j in range(len(x)):
-                    self.activeweak2[i, j] = - alpha[j] - np.sum(beta[j, :] * x[i, :])
-
-                    if self.activeweak2[i, j] > activetmp:
-                        activetmp = self.activeweak2[i, j]
-
-            # find the maximal violated constraint in sub-loop and added into the active matrix
-                for j in range(len(x)):
-                    if self.activeweak2[i, j] >= activetmp and activetmp > 0:
-                        self.activeweak[i, j] = 1
-                if activetmp > activetmp1:
-                    activetmp1 = activetmp
-
-        elif self.rts == RTS_VRS and self.fun == FUN_COST:
-        # go into the loop
-            for i in range(len(x)):
-                activetmp = 0.0
-                # go into the sub-loop and find the violated concavity constraints
-                for j in range(len(x)):
-                    self.activeweak2[i, j] = alpha[j] + np.sum(beta[j, :] * x[i, :])
-
-                    if self.activeweak2[i, j] > activetmp:
-                        activetmp = self.activeweak2[i, j]
-
-            # find the maximal violated constraint in sub-loop and added into the active matrix
-                for j in range(len(x)):
-                    if self.activeweak2[i, j] >= activetmp and activetmp > 0:
-                        self.activeweak[i, j] = 1
-                if activetmp > activetmp1:
-                    activetmp1 = activetmp
-
-        elif self.rts == RTS_CRS and self.fun == FUN_PROD:
-        # go into the loop
-            for i in range(len(x)):
-                activetmp = 0.0
-                # go into the sub-loop and find the violated concavity constraints
-                for j in range(len(x)):
-                    self.activeweak2[i, j] = - np.sum(beta[j, :] * x[i, :])
-
-                    if self.activeweak2[i, j] > activetmp:
-                        activetmp = self.activeweak2[i, j]
-
-            # find the maximal violated constraint in sub-loop and added into the active matrix
-                for j in range(len(x)):
-                    if self.activeweak2[i, j] >= activetmp and activetmp > 0:
-                        self.activeweak[i, j] = 1
-                if activetmp > activetmp1:
-                    activetmp1 = activetmp
-
-        elif self.rts == RTS_CRS and self.fun == FUN_COST:
-        # go into the loop
-            for i in range(len(x)):
-                activetmp = 0.0
-                # go into the sub-loop and find the violated concavity constraints
-                for j in range(len(x)):
-                    self.activeweak2[i, j] = np.sum(beta[j, :] * x[i, :])
-                    if self.activeweak2[i, j] > activetmp:
-                        activetmp = self.activeweak2[i, j]
-
-            # find the maximal violated constraint in sub-loop and added into the active matrix
-                for j in range(len(x)):
-                    if self.activeweak2[i, j] >= activetmp and activetmp > 0:
-                        self.activeweak[i, j] = 1
-                if activetmp > activetmp1:
-                    activetmp1 = activetmp
-        return activetmp
+    def __violated(self, alpha, beta, delta):
+        """Return True if the estimates violate a constraint that is not active yet
+
+        A violation left on an active constraint is the rounding error of the
+        solver or of the convergence test, solving the same active set again
+        would only return the same estimates.
+        """
+        solved = np.count_nonzero(self.active) + np.count_nonzero(self.activeweak)
+        return max(self._run_convergence(alpha, beta, delta)) > 0.0001 \
+            and np.count_nonzero(self.active) + np.count_nonzero(self.activeweak) > solved
+
+    def _run_convergence(self, alpha, beta, delta):
+        """Return the maximal violation of the concavity and the weak disposability constraints"""
+        if self.numba_convergence and _convergence_numba.NUMBA_AVAILABLE:
+            return self.__run_convergence_numba(alpha, beta, delta)
+
+        self.__fill_violation(alpha, beta, delta)
+        return self.__update_active(self.active2, self.active), \
+            self.__update_active(self.activeweak2, self.activeweak)
+
+    def __fill_violation(self, alpha, beta, delta):
+        """Compute the violation of the concavity and the weak disposability constraints"""
+        dtype = np.float32 if self.low_precision_convergence else np.float64
+        if self.active2.dtype != dtype:
+            self.active2 = np.empty(self.active2.shape, dtype=dtype)
+            self.activeweak2 = np.empty(self.activeweak2.shape, dtype=dtype)
+        x = self._x_np.astype(dtype, copy=False)
+        b = self._b_np.astype(dtype, copy=False)
+        beta = np.ascontiguousarray(beta, dtype=dtype)
+        delta = np.ascontiguousarray(delta, dtype=dtype)
+        # CRS drops the intercepts and the cost frontier flips the sign of the violation
+        alpha = np.asarray(alpha, dtype=dtype) if self.rts == RTS_VRS else np.zeros(x.shape[0], dtype=dtype)
+        sign = -1.0 if self.fun == FUN_COST else 1.0
+
+        # BX[j, i] = beta[j]x[i] and DB[j, i] = delta[j]b[i], shared by both tests
+        BX = np.dot(beta, x.T)
+        DB = np.dot(delta, b.T)
+        # bx_self[i] = beta[i]x[i] and db_self[i] = delta[i]b[i]
+        bx_self = _row_dot(beta, x)
+        db_self = _row_dot(delta, b)
+        # fill the preallocated buffers in place
+        np.subtract((alpha + bx_self + db_self)[:, None], alpha[None, :], out=self.active2)
+        self.active2 -= BX.T
+        self.active2 -= DB.T
+        self.active2 *= sign
+        np.add(alpha[None, :], BX.T, out=self.activeweak2)
+        self.activeweak2 *= - sign
+
+    def __run_convergence_numba(self, alpha, beta, delta):
+        """Run the convergence tests with the numba kernels"""
+        x = self._x_np
+        b = self._b_np
+        beta = np.ascontiguousarray(beta, dtype=np.float64)
+        delta = np.ascontiguousarray(delta, dtype=np.float64)
+        rts_code = 1 if self.rts == RTS_VRS else 0
+        fun_code = -1 if self.fun == FUN_COST else 1
+        if self.rts == RTS_VRS:
+            alpha = np.asarray(alpha, dtype=np.float64)
+        else:
+            alpha = np.zeros(x.shape[0])
+        return _convergence_numba.convergence_test(
+                    alpha, beta, delta, x, b, rts_code, fun_code, self.active2, self.active), \
+            _convergence_numba.convergence_test_weak(
+                    alpha, beta, x, rts_code, fun_code, self.activeweak2, self.activeweak)
+
+    def __update_active(self, violation, active):
+        """Add the maximal violated constraint of each row into the active matrix"""
+        row_max = violation.max(axis=1)
+        active[(violation >= row_max[:, None]) & (row_max[:, None] > 0)] = True
+        return max(float(row_max.max()), 0.0)
+
+    def __add_candidate(self, violation, active, k):
+        """Return a copy of the active matrix with the k largest violated constraints of each row added"""
+        candidate = active.copy()
+        k = min(k, violation.shape[1])
+        rows = np.arange(violation.shape[0])[:, None]
+        cols = np.argpartition(-violation, k - 1, axis=1)[:, :k]
+        candidate[rows, cols] |= violation[rows, cols] > 0
+        return candidate
 
     def display_status(self):
         """Display the status of problem"""
@@ -294,11 +302,7 @@ class weakCNLSG:
     def get_beta(self):
         """Return beta value by array"""
         tools.assert_optimized(self.optimization_status)
-        beta = np.asarray([i + tuple([j]) for i, j in zip(list(self.__model__.beta),
-                                                          list(self.__model__.beta[:, :].value))])
-        beta = pd.DataFrame(beta, columns=['Name', 'Key', 'Value'])
-        beta = beta.pivot(index='Name', columns='Key', values='Value')
-        return beta.to_numpy()
+        return tools.to_2d_array(self.__model__.beta)
 
     def get_residual(self):
         """Return residual value by array"""
@@ -329,8 +333,4 @@ class weakCNLSG:
         """Return delta value by array"""
         tools.assert_optimized(self.optimization_status)
         tools.assert_undesirable_output(self.b)
-        delta = np.asarray([i + tuple([j]) for i, j in zip(list(self.__model__.delta),
-                                                           list(self.__model__.delta[:, :].value))])
-        delta = pd.DataFrame(delta, columns=['Name', 'Key', 'Value'])
-        delta = delta.pivot(index='Name', columns='Key', values='Value')
-        return delta.to_numpy()
\ No newline at end of file
+        return tools.to_2d_array(self.__model__.delta)
\ No newline at end of file
@@ -1,8 +1,7 @@
 # import dependencies
 import numpy as np
-import pandas as pd
 from .utils import weakCNLSbZG1, weakCNLSbZG2, weakCNLSbG1, weakCNLSbG2, sweet, tools
-from .constant import CET_ADDI, CET_MULT, FUN_PROD, FUN_COST, OPT_DEFAULT, RTS_CRS, RTS_VRS,OPT_LOCAL
+from .constant import CET_ADDI, CET_MULT, FUN_PROD, FUN_COST, OPT_DEFAULT, RTS_VRS,OPT_LOCAL
 import time
 from . import weakCNLSG
 
@@ -26,8 +25,12 @@ class weakCNLSbG(weakCNLSG.weakCNLSG):
             rts (String, optional): RTS_VRS (variable returns to scale) or RTS_CRS (constant returns to scale). Defaults to RTS_VRS.
         """
         # TODO(error/warning handling): Check the configuration of the model exist
-        self.cutactive = sweet.sweet(np.column_stack(x, b))
         self.y, self.x, self.b, self.z = tools.assert_valid_wp_data(y, x, b, z)
+        # contiguous copies of the data for the convergence test
+        self._x_np = np.ascontiguousarray(self.x, dtype=np.float64)
+        self._b_np = np.ascontiguousarray(self.b, dtype=np.float64)
+        self._y_np = np.ascontiguousarray(self.y, dtype=np.float64).reshape(len(self.y), -1)
+        self.cutactive = sweet.sweet(np.hstack((self._x_np, self._b_np)))
         self.cet = cet
         self.fun = fun
         self.rts = rts
@@ -46,8 +49,16 @@ class weakCNLSbG(weakCNLSG.weakCNLSG):
         self.optimization_status = 0
         self.problem_status = 0
 
-    def optimize(self, email=OPT_LOCAL, solver=OPT_DEFAULT):
-        """Optimize the function by requested method"""
+    def optimize(self, email=OPT_LOCAL, solver=OPT_DEFAULT, n_jobs=1):
+        """Optimize the function by requested method
+
+        Args:
+            email (string): The email address for remote optimization. It will optimize locally if OPT_LOCAL is given.
+            solver (string): The solver chosen for optimization. It will optimize with default solver if OPT_DEFAULT is given.
+            n_jobs (int, optional): Only 1 is supported, the active sets are solved sequentially. Defaults to 1.
+        """
+        if n_jobs != 1:
+            raise ValueError("%s solves the active sets sequentially, n_jobs must be 1." % self.__class__.__name__)
         # TODO(error/warning handling): Check problem status after optimization
         self.t0 = time.time()
         if type(self.z) != type(None):
@@ -86,164 +97,48 @@ class weakCNLSbG(weakCNLSG.weakCNLSG):
         self.tt = time.time() - self.t0
 
     def __convergence_test(self, alpha, beta, gamma):
-        x = np.asarray(self.x)
-        y = np.asarray(self.y)
+        x = self._x_np
+        y = self._y_np
+        n = x.shape[0]
+        # CRS drops the intercepts and the cost frontier flips the sign of the violation
+        alpha = np.asarray(alpha, dtype=np.float64) if self.rts == RTS_VRS else np.zeros(n)
+        sign = -1.0 if self.fun == FUN_COST else 1.0
+        A2 = self.active2
+        A = self.active
         activetmp1 = 0.0
-        if self.rts == RTS_VRS and self.fun == FUN_PROD:
-            # go into the loop
-            for i in range(len(x)):
-                activetmp = 0.0
-                # go into the sub-loop and find the violated concavity constraints
-                for j in range(len(x)):
-                    self.active2[i, j] = alpha[i] \
-                                         + np.sum(beta[i, :] * x[i, :]) - np.sum(gamma[i, :] * y[i, :]) - \
-                                         alpha[j] - np.sum(beta[j, :] * x[i, :]) + np.sum(gamma[j, :] * y[i, :])
-
-                    if self.active2[i, j] > activetmp:
-                        activetmp = self.active2[i, j]
-
-                # find the maximal violated constraint in sub-loop and added into the active matrix
-                for j in range(len(x)):
-                    if self.active2[i, j] >= activetmp and activetmp > 0:
-                        self.active[i, j] = 1
-                if activetmp > activetmp1:
-                    activetmp1 = activetmp
-
-
-        elif self.rts == RTS_VRS and self.fun == FUN_COST:
-            # go into the loop
-            for i in range(len(x)):
-                activetmp = 0.0
-                # go into the sub-loop and find the violated concavity constraints
-                for j in range(len(x)):
-                    self.active2[i, j] = - alpha[i] \
-                                         - np.sum(beta[i, :] * x[i, :]) + np.sum(gamma[i, :] * y[i, :]) + \
-                                         alpha[j] + np.sum(beta[j, :] * x[i, :]) - np.sum(gamma[j, :] * y[i, :])
-
-                    if self.active2[i, j] > activetmp:
-                        activetmp = self.active2[i, j]
-
-                # find the maximal violated constraint in sub-loop and added into the active matrix
-                for j in range(len(x)):
-                    if self.active2[i, j] >= activetmp and activetmp > 0:
-                        self.active[i, j] = 1
-                if activetmp > activetmp1:
-                    activetmp1 = activetmp
-
-
-        elif self.rts == RTS_CRS and self.fun == FUN_PROD:
-            # go into the loop
-            for i in range(len(x)):
-                activetmp = 0.0
-                # go into the sub-loop and find the violated concavity constraints
-                for j in range(len(x)):
-                    self.active2[i, j] = np.sum(beta[i, :] * x[i, :]) - np.sum(gamma[i, :] * y[i, :]) \
-                                          - np.sum(beta[j, :] * x[i, :]) + np.sum(gamma[j, :] * y[i, :])
-
-                    if self.active2[i, j] > activetmp:
-                        activetmp = self.active2[i, j]
-
-                # find the maximal violated constraint in sub-loop and added into the active matrix
-                for j in range(len(x)):
-                    if self.active2[i, j] >= activetmp and activetmp > 0:
-                        self.active[i, j] = 1
-                if activetmp > activetmp1:
-                    activetmp1 = activetmp
-
-        elif self.rts == RTS_CRS and self.fun == FUN_COST:
-            # go into the loop
-            for i in range(len(x)):
-                activetmp = 0.0
-                # go into the sub-loop and find the violated concavity constraints
-                for j in range(len(x)):
-                    self.active2[i, j] = - np.sum(beta[i, :] * x[i, :]) + np.sum(gamma[i, :] * y[i, :]) \
-                                          + np.sum(beta[j, :] * x[i, :]) - np.sum(gamma[j, :] * y[i, :])
-                    if self.active2[i, j] > activetmp:
-                        activetmp = self.active2[i, j]
-
-                # find the maximal violated constraint in sub-loop and added into the active matrix
-                for j in range(len(x)):
-                    if self.active2[i, j] >= activetmp and activetmp > 0:
-                        self.active[i, j] = 1
-                if activetmp > activetmp1:
-                    activetmp1 = activetmp
-        return activetmp
+        for i in range(n):
+            # find the violated constraints of the row in one broadcast
+            A2[i, :] = sign * (alpha[i] + np.dot(beta[i, :], x[i, :]) - np.dot(gamma[i, :], y[i, :])
+                               - alpha - np.dot(beta, x[i, :]) + np.dot(gamma, y[i, :]))
+            activetmp = max(A2[i, :].max(), 0.0)
+
+            # find the maximal violated constraint in the row and added into the active matrix
+            if activetmp > 0:
+                A[i, A2[i, :] >= activetmp] = 1
+            if activetmp > activetmp1:
+                activetmp1 = activetmp
+        return activetmp1
 
     def __convergence_test_weak(self, alpha, beta, gamma):
-        x = np.asarray(self.x)
-        y = np.asarray(self.y)
+        x = self._x_np
+        n = x.shape[0]
+        # CRS drops the intercepts and the cost frontier flips the sign of the violation
+        alpha = np.asarray(alpha, dtype=np.float64) if self.rts == RTS_VRS else np.zeros(n)
+        sign = -1.0 if self.fun == FUN_COST else 1.0
+        A2 = self.activeweak2
+        A = self.activeweak
         activetmp1 = 0.0
-        if self.rts == RTS_VRS and self.fun == FUN_PROD:
-            # go into the loop
-            for i in range(len(x)):
-                activetmp = 0.0
-                # go into the sub-loop and find the violated concavity constraints
-                for j in range(len(x)):
-                    self.activeweak2[i, j] = - alpha[j] - np.sum(beta[j, :] * x[i, :])
-
-                    if self.activeweak2[i, j] > activetmp:
-                        activetmp = self.activeweak2[i, j]
-
-                # find the maximal violated constraint in sub-loop and added into the active matrix
-                for j in range(len(x)):
-                    if self.activeweak2[i, j] >= activetmp and activetmp > 0:
-                        self.activeweak[i, j] = 1
-                if activetmp > activetmp1:
-                    activetmp1 = activetmp
-
-        elif self.rts == RTS_VRS and self.fun == FUN_COST:
-            # go into the loop
-            for i in range(len(x)):
-                activetmp = 0.0
-                # go into the sub-loop and find the violated concavity constraints
-                for j in range(len(x)):
-                    self.activeweak2[i, j] = alpha[j] + np.sum(beta[j, :] * x[i, :])
-
-                    if self.activeweak2[i, j] > activetmp:
-                        activetmp = self.activeweak2[i, j]
-
-                # find the maximal violated constraint in sub-loop and added into the active matrix
-                for j in range(len(x)):
-                    if self.activeweak2[i, j] >= activetmp and activetmp > 0:
-                        self.activeweak[i, j] = 1
-                if activetmp > activetmp1:
-                    activetmp1 = activetmp
-
-        elif self.rts == RTS_CRS and self.fun == FUN_PROD:
-            # go into the loop
-            for i in range(len(x)):
-                activetmp = 0.0
-                # go into the sub-loop and find the violated concavity constraints
-                for j in range(len(x)):
-                    self.activeweak2[i, j] = - np.sum(beta[j, :] * x[i, :])
-
-                    if self.activeweak2[i, j] > activetmp:
-                        activetmp = self.activeweak2[i, j]
-
-                # find the maximal violated constraint in sub-loop and added into the active matrix
-                for j in range(len(x)):
-                    if self.activeweak2[i, j] >= activetmp and activetmp > 0:
-                        self.activeweak[i, j] = 1
-                if activetmp > activetmp1:
-                    activetmp1 = activetmp
-
-        elif self.rts == RTS_CRS and self.fun == FUN_COST:
-            # go into the loop
-            for i in range(len(x)):
-                activetmp = 0.0
-                # go into the sub-loop and find the violated concavity constraints
-                for j in range(len(x)):
-                    self.activeweak2[i, j] = np.sum(beta[j, :] * x[i, :])
-                    if self.activeweak2[i, j] > activetmp:
-                        activetmp = self.activeweak2[i, j]
-
-                # find the maximal violated constraint in sub-loop and added into the active matrix
-                for j in range(len(x)):
-                    if self.activeweak2[i, j] >= activetmp and activetmp > 0:
-                        self.activeweak[i, j] = 1
-                if activetmp > activetmp1:
-                    activetmp1 = activetmp
-        return activetmp
+        for i in range(n):
+            # find the violated constraints of the row in one broadcast
+            A2[i, :] = sign * (- alpha - np.dot(beta, x[i, :]))
+            activetmp = max(A2[i, :].max(), 0.0)
+
+            # find the maximal violated constraint in the row and added into the active matrix
+            if activetmp > 0:
+                A[i, A2[i, :] >= activetmp] = 1
+            if activetmp > activetmp1:
+                activetmp1 = activetmp
+        return activetmp1
 
     def display_status(self):
         """Display the status of problem"""
@@ -292,11 +187,7 @@ class weakCNLSbG(weakCNLSG.weakCNLSG):
     def get_beta(self):
         """Return beta value by array"""
         tools.assert_optimized(self.optimization_status)
-        beta = np.asarray([i + tuple([j]) for i, j in zip(list(self.__model__.beta),
-                                                          list(self.__model__.beta[:, :].value))])
-        beta = pd.DataFrame(beta, columns=['Name', 'Key', 'Value'])
-        beta = beta.pivot(index='Name', columns='Key', values='Value')
-        return beta.to_numpy()
+        return tools.to_2d_array(self.__model__.beta)
 
     def get_residual(self):
         """Return residual value by array"""
@@ -327,8 +218,4 @@ class weakCNLSbG(weakCNLSG.weakCNLSG):
         """Return gamma value by array"""
         tools.assert_optimized(self.optimization_status)
         tools.assert_desirable_output(self.y)
-        gamma = np.asarray([i + tuple([j]) for i, j in zip(list(self.__model__.gamma),
-                                                           list(self.__model__.gamma[:, :].value))])
-        gamma = pd.DataFrame(gamma, columns=['Name', 'Key', 'Value'])
-        gamma = gamma.pivot(index='Name', columns='Key', values='Value')
-        return gamma.to_numpy()
+        return tools.to_2d_array(self.__model__.gamma)
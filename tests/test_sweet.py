@@ -0,0 +1,12 @@
+# import packages
+import numpy as np
+from pystoned2.utils import sweet
+
+
+def test_sweet_pairs():
+    rng = np.random.default_rng(0)
+    cutactive = sweet.sweet(rng.uniform(1, 2, (40, 3)))
+    expected = [(i, h) for i in range(40) for h in range(40) if cutactive[i][h] and i != h]
+    assert expected
+    assert sweet.sweet_pairs(cutactive) == expected
+    assert all(type(i) is int and type(h) is int for i, h in sweet.sweet_pairs(cutactive))
@@ -0,0 +1,33 @@
+# import packages
+import numpy as np
+from pyomo.environ import ConcreteModel, Set, Var
+from pystoned2.utils import tools
+
+
+def build_variable(n, k):
+    model = ConcreteModel()
+    model.I = Set(initialize=range(n))
+    model.J = Set(initialize=range(k))
+    model.beta = Var(model.I, model.J)
+    return model.beta
+
+
+def test_to_2d_array():
+    # each unit is valued 10*i + j, so the row-major order can be checked entry by entry
+    beta = build_variable(3, 2)
+    for i in range(3):
+        for j in range(2):
+            beta[i, j].value = 10 * i + j
+    value = tools.to_2d_array(beta)
+    assert value.shape == (3, 2)
+    assert value.dtype == np.float64
+    np.testing.assert_array_equal(value, [[0, 1], [10, 11], [20, 21]])
+
+
+def test_to_2d_array_unset_value():
+    beta = build_variable(2, 2)
+    beta[0, 0].value = 1
+    beta[1, 1].value = 2
+    value = tools.to_2d_array(beta)
+    np.testing.assert_array_equal(np.isnan(value), [[False, True], [True, False]])
+    assert value[0, 0] == 1 and value[1, 1] == 2
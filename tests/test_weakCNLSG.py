@@ -0,0 +1,287 @@
+# import packages
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pytest
+from pystoned2 import weakCNLSG, weakCNLSbG, weakCNLSxG
+from pystoned2.utils import _convergence_numba
+from pystoned2.constant import FUN_COST, FUN_PROD, RTS_CRS, RTS_VRS
+
+# small random data and estimates, the convergence test needs no solver
+rng = np.random.default_rng(0)
+n = 12
+y = rng.uniform(1, 2, n)
+x = rng.uniform(1, 2, (n, 2))
+b = rng.uniform(1, 2, (n, 1))
+estimates = [(rng.normal(size=n), rng.uniform(0, 1, (n, 2)), rng.uniform(0, 1, (n, 1)))
+             for _ in range(2)]
+
+SPECIFICATIONS = [(RTS_VRS, FUN_PROD), (RTS_VRS, FUN_COST), (RTS_CRS, FUN_PROD), (RTS_CRS, FUN_COST)]
+
+
+def reference_convergence(alpha, beta, delta, rts, fun, active, activeweak):
+    """Element-wise loop of the convergence tests, updating both masks in place"""
+    sign = -1.0 if fun == FUN_COST else 1.0
+    if rts == RTS_CRS:
+        alpha = np.zeros(n)
+    active2 = np.zeros((n, n))
+    activeweak2 = np.zeros((n, n))
+    for i in range(n):
+        for j in range(n):
+            active2[i, j] = sign * (alpha[i] + np.sum(beta[i, :] * x[i, :]) + np.sum(delta[i, :] * b[i, :])
+                                    - alpha[j] - np.sum(beta[j, :] * x[i, :]) - np.sum(delta[j, :] * b[i, :]))
+            activeweak2[i, j] = - sign * (alpha[j] + np.sum(beta[j, :] * x[i, :]))
+    violation = reference_active(active2, active), reference_active(activeweak2, activeweak)
+    return violation, active2, activeweak2
+
+
+def reference_active(value, mask):
+    """Add the maximal violated constraint of each row into the mask and return the maximal violation"""
+    activetmp1 = 0.0
+    for i in range(n):
+        activetmp = max(value[i, :].max(), 0.0)
+        for j in range(n):
+            if value[i, j] >= activetmp and activetmp > 0:
+                mask[i, j] = True
+        activetmp1 = max(activetmp1, activetmp)
+    return activetmp1
+
+
+def assert_same_mask(mask, expected, skip_diagonal=False):
+    # the concavity violation of unit i against itself is 0 up to rounding,
+    # so its diagonal entry depends on the order of the floating point sums
+    if skip_diagonal:
+        off = ~np.eye(n, dtype=bool)
+        np.testing.assert_array_equal(mask[off], expected[off])
+    else:
+        np.testing.assert_array_equal(mask, expected)
+
+
+@pytest.mark.parametrize('rts, fun', SPECIFICATIONS)
+def test_convergence(rts, fun):
+    model = weakCNLSG.weakCNLSG(y=y, x=x, b=b, fun=fun, rts=rts)
+    active = np.zeros((n, n), dtype=bool)
+    activeweak = np.zeros((n, n), dtype=bool)
+    # the second pass checks that the masks accumulate across iterations
+    for alpha, beta, delta in estimates:
+        violation = model._run_convergence(alpha, beta, delta)
+        expected, active2, activeweak2 = reference_convergence(
+            alpha, beta, delta, rts, fun, active, activeweak)
+        np.testing.assert_allclose(violation, expected, rtol=0, atol=1e-12)
+        np.testing.assert_allclose(model.active2, active2, rtol=0, atol=1e-12)
+        np.testing.assert_allclose(model.activeweak2, activeweak2, rtol=0, atol=1e-12)
+        assert_same_mask(model.active, active, skip_diagonal=True)
+        assert_same_mask(model.activeweak, activeweak)
+
+
+@pytest.mark.skipif(not _convergence_numba.NUMBA_AVAILABLE, reason='numba is not installed')
+@pytest.mark.parametrize('rts, fun', SPECIFICATIONS)
+def test_convergence_numba(rts, fun):
+    model = weakCNLSG.weakCNLSG(y=y, x=x, b=b, fun=fun, rts=rts)
+    model_numba = weakCNLSG.weakCNLSG(y=y, x=x, b=b, fun=fun, rts=rts)
+    model_numba.numba_convergence = True
+    for alpha, beta, delta in estimates:
+        violation = model._run_convergence(alpha, beta, delta)
+        violation_numba = model_numba._run_convergence(alpha, beta, delta)
+        np.testing.assert_allclose(violation_numba, violation, rtol=0, atol=1e-12)
+        np.testing.assert_allclose(model_numba.active2, model.active2, rtol=0, atol=1e-12)
+        np.testing.assert_allclose(model_numba.activeweak2, model.activeweak2, rtol=0, atol=1e-12)
+        assert_same_mask(model_numba.active, model.active, skip_diagonal=True)
+        assert_same_mask(model_numba.activeweak, model.activeweak)
+
+
+@pytest.mark.parametrize('model', [weakCNLSbG.weakCNLSbG, weakCNLSxG.weakCNLSxG])
+def test_sequential_n_jobs(model):
+    with pytest.raises(ValueError):
+        model(y=y, x=x, b=b).optimize(n_jobs=2)
+
+
+def test_add_candidate():
+    model = weakCNLSG.weakCNLSG(y=y, x=x, b=b)
+    add_candidate = model._weakCNLSG__add_candidate
+    violation = np.array([[3.0, -1.0, 2.0, 0.5],
+                          [-1.0, -2.0, -3.0, -4.0],
+                          [1.0, 4.0, -0.5, 2.5],
+                          [0.0, -1.0, 0.2, -2.0]])
+    active = np.zeros((4, 4), dtype=bool)
+    active[1, 0] = True
+
+    # the k largest violations of each row, only if they are violated
+    expected = active.copy()
+    expected[0, [0, 2]] = expected[2, [1, 3]] = expected[3, 2] = True
+    np.testing.assert_array_equal(add_candidate(violation, active, 2), expected)
+
+    # k larger than the number of units adds every violated constraint
+    expected[0, 3] = expected[2, 0] = True
+    np.testing.assert_array_equal(add_candidate(violation, active, 10), expected)
+
+    # the active matrix itself is left untouched
+    assert active.sum() == 1 and active[1, 0]
+
+
+class FakeModel:
+    """Solved model returning the given estimates"""
+
+    def __init__(self, alpha, beta, delta):
+        self.alpha, self.beta, self.delta = alpha, beta, delta
+        self.__model__ = object()
+
+    def optimize(self, email, solver):
+        pass
+
+    def get_alpha(self):
+        return self.alpha
+
+    def get_beta(self):
+        return self.beta
+
+    def get_delta(self):
+        return self.delta
+
+
+# a common hyperplane violates none of the constraints
+concave = (np.ones(n), np.full((n, 2), 0.5), np.full((n, 1), 0.5))
+
+
+def patch_solver(monkeypatch, initial, solve):
+    """Replace the solvers of the initial and the iterative models, and run the pool in threads"""
+    model1 = FakeModel(*initial)
+    calls = []
+
+    def optimize_model2(y, x, b, z, cutactive, active, activeweak, cet, fun, rts, email, solver, threads=None):
+        calls.append((threads, active, activeweak))
+        return FakeModel(*solve(active, activeweak))
+
+    monkeypatch.setattr(weakCNLSG.weakCNLSG1, 'weakCNLSG1', lambda *args: model1)
+    monkeypatch.setattr(weakCNLSG, '_optimize_model2', optimize_model2)
+    monkeypatch.setattr(weakCNLSG, 'ProcessPoolExecutor', ThreadPoolExecutor)
+    monkeypatch.setattr(weakCNLSG, '_limit_solver_threads', lambda: None)
+    return model1, calls
+
+
+def test_optimize_parallel(monkeypatch):
+    # the sizes of the three candidate active sets built from the initial estimates
+    model = weakCNLSG.weakCNLSG(y=y, x=x, b=b)
+    model._run_convergence(*estimates[0])
+    size = [model._weakCNLSG__add_candidate(model.active2, model.active, k + 1).sum()
+            + model._weakCNLSG__add_candidate(model.activeweak2, model.activeweak, k + 1).sum()
+            for k in range(3)]
+    assert size[0] < size[1] < size[2]
+
+    # only the largest candidate gives the concave estimates
+    def solve(active, activeweak):
+        return concave if active.sum() + activeweak.sum() >= size[2] else estimates[0]
+
+    model1, calls = patch_solver(monkeypatch, estimates[0], solve)
+    model = weakCNLSG.weakCNLSG(y=y, x=x, b=b)
+    model.optimize(n_jobs=3)
+
+    assert model.count == 1
+    # three single-threaded candidates, then the accepted iterate solved again locally
+    assert [threads for threads, _, _ in calls] == [1, 1, 1, None]
+    assert calls[-1][1] is model.active and calls[-1][2] is model.activeweak
+    assert model.active.sum() + model.activeweak.sum() >= size[2]
+    assert model.__model__ is not model1.__model__
+    np.testing.assert_array_equal(model.beta, concave[1])
+
+
+def test_optimize_parallel_converged(monkeypatch):
+    # the initial model is already concave, so no candidate is solved
+    model1, calls = patch_solver(monkeypatch, concave, lambda active, activeweak: concave)
+    model = weakCNLSG.weakCNLSG(y=y, x=x, b=b)
+    model.optimize(n_jobs=3)
+
+    assert model.count == 0
+    assert calls == []
+    assert model.__model__ is model1.__model__
+
+
+@pytest.mark.parametrize('rts, fun', SPECIFICATIONS)
+def test_convergence_low_precision(rts, fun):
+    # estimates around 1e3, where the float32 error is larger than the tolerance
+    model = weakCNLSG.weakCNLSG(y=y, x=1000 * x, b=1000 * b, fun=fun, rts=rts)
+    model_float32 = weakCNLSG.weakCNLSG(y=y, x=1000 * x, b=1000 * b, fun=fun, rts=rts)
+    model_float32.low_precision_convergence = True
+    for alpha, beta, delta in estimates:
+        violation = model._run_convergence(1000 * alpha, beta, delta)
+        violation_float32 = model_float32._run_convergence(1000 * alpha, beta, delta)
+        assert model_float32.active2.dtype == np.float32
+        tol = 8 * np.finfo(np.float32).eps * np.abs(model.active2).max()
+        np.testing.assert_allclose(violation_float32, violation, rtol=0, atol=tol)
+        np.testing.assert_allclose(model_float32.active2, model.active2, rtol=0, atol=tol)
+        np.testing.assert_allclose(model_float32.activeweak2, model.activeweak2, rtol=0, atol=tol)
+
+
+@pytest.mark.parametrize('n_jobs, solves', [(1, 1), (3, 7)])
+def test_optimize_no_new_constraint(monkeypatch, n_jobs, solves):
+    # the solver never removes the violation, as when it only comes from rounding
+    def solve(active, activeweak):
+        assert len(calls) <= 10
+        return estimates[0]
+
+    model1, calls = patch_solver(monkeypatch, estimates[0], solve)
+    model = weakCNLSG.weakCNLSG(y=y, x=x, b=b)
+    model.optimize(n_jobs=n_jobs)
+
+    # one iteration adds the violated constraints, the next one has nothing to add
+    assert model.count == 1
+    assert len(calls) == solves
+
+
+def reference_convergence_weak_model(alpha, coef, data, gamma, weak, rts, fun, active, activeweak):
+    """Element-wise loop of the weakCNLSbG/weakCNLSxG convergence tests
+
+    coef is the coefficient of data (beta of x, or delta of b), weak(alpha, i, j)
+    returns the weak disposability violation before the sign of the frontier.
+    """
+    sign = -1.0 if fun == FUN_COST else 1.0
+    if rts == RTS_CRS:
+        alpha = np.zeros(n)
+    y2 = y.reshape(n, 1)
+    active2 = np.zeros((n, n))
+    activeweak2 = np.zeros((n, n))
+    for i in range(n):
+        for j in range(n):
+            active2[i, j] = sign * (alpha[i] + np.sum(coef[i, :] * data[i, :]) - np.sum(gamma[i, :] * y2[i, :])
+                                    - alpha[j] - np.sum(coef[j, :] * data[i, :]) + np.sum(gamma[j, :] * y2[i, :]))
+            activeweak2[i, j] = sign * weak(alpha, i, j)
+    violation = reference_active(active2, active), reference_active(activeweak2, activeweak)
+    return violation, active2, activeweak2
+
+
+
+def assert_same_convergence(model, violation, expected, active, activeweak):
+    np.testing.assert_allclose(violation, expected[0], rtol=0, atol=1e-12)
+    np.testing.assert_allclose(model.active2, expected[1], rtol=0, atol=1e-12)
+    np.testing.assert_allclose(model.activeweak2, expected[2], rtol=0, atol=1e-12)
+    assert_same_mask(model.active.astype(bool), active, skip_diagonal=True)
+    assert_same_mask(model.activeweak.astype(bool), activeweak)
+
+
+@pytest.mark.parametrize('rts, fun', SPECIFICATIONS)
+def test_convergence_bG(rts, fun):
+    model = weakCNLSbG.weakCNLSbG(y=y.reshape(n, 1), x=x, b=b, fun=fun, rts=rts)
+    active = np.zeros((n, n), dtype=bool)
+    activeweak = np.zeros((n, n), dtype=bool)
+    for alpha, beta, gamma in estimates:
+        # the maximal violation over all rows, not the one of the last row
+        violation = model._weakCNLSbG__convergence_test(alpha, beta, gamma), \
+            model._weakCNLSbG__convergence_test_weak(alpha, beta, gamma)
+        expected = reference_convergence_weak_model(
+            alpha, beta, x, gamma, lambda alpha, i, j: - alpha[j] - np.sum(beta[j, :] * x[i, :]),
+            rts, fun, active, activeweak)
+        assert_same_convergence(model, violation, expected, active, activeweak)
+
+
+@pytest.mark.parametrize('rts, fun', SPECIFICATIONS)
+def test_convergence_xG(rts, fun):
+    model = weakCNLSxG.weakCNLSxG(y=y.reshape(n, 1), x=x, b=b, fun=fun, rts=rts)
+    active = np.zeros((n, n), dtype=bool)
+    activeweak = np.zeros((n, n), dtype=bool)
+    for alpha, gamma, delta in estimates:
+        gamma = gamma[:, :1]
+        violation = model._weakCNLSxG__convergence_test(alpha, gamma, delta), \
+            model._weakCNLSxG__convergence_test_weak(alpha, gamma, delta)
+        expected = reference_convergence_weak_model(
+            alpha, delta, b, gamma, lambda alpha, i, j: - alpha[j] - np.sum(x[i, :]),
+            rts, fun, active, activeweak)
+        assert_same_convergence(model, violation, expected, active, activeweak)